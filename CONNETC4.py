@@ -1,648 +1,1098 @@
-import tkinter as tk
-from tkinter import messagebox
-import math
-import copy
-
-# ==============================================================================
-# SECTION 0: CONFIGURATION (CONSTANTS)
-# These variables do not change during the game.
-# ==============================================================================
-
-# The board size (Integers)
-ROWS = 6
-COLS = 7
-
-# Codes for the pieces on the board (Integers)
-# We use numbers because they are easy to store in a list.
-EMPTY_SLOT = 0
-PLAYER_HUMAN_ID = 1  # Red piece
-PLAYER_AI_ID = 2     # Yellow piece
-
-# AI Configuration
-# 7 is deep enough to be smart, but fast thanks to optimization.
-AI_MAX_SEARCH_DEPTH = 7  
-
-# Scoring values (Integers)
-SCORE_WIN = 1000000 
-SCORE_DRAW = 0
-
-
-# ==============================================================================
-# SECTION 1: THE BOARD LOGIC (GAME RULES)
-# This class handles the data and rules of Connect 4.
-# ==============================================================================
-
-class ConnectFourBoard:
-    def __init__(self):
-        # Create the board as a "List of Lists" (2D Array).
-        # It represents a grid of 6 rows and 7 columns, filled with 0s initially.
-        self.board = []
-        for r in range(ROWS):
-            # Create a row of 7 zeros
-            new_row = [EMPTY_SLOT] * COLS
-            self.board.append(new_row)
-
-    def get_legal_actions(self):
-        """
-        Returns a list of column numbers where a player is allowed to drop a piece.
-        A column is legal if the top cell (row 0) is empty.
-        """
-        valid_columns = []
-        
-        # Loop through every column index from 0 to 6
-        for col_index in range(COLS):
-            # Check if the top spot in this column is empty
-            if self.board[0][col_index] == EMPTY_SLOT:
-                valid_columns.append(col_index)
-                
-        return valid_columns
-
-    def make_move(self, column_index, player_id):
-        """
-         drops a piece into a column. It falls to the lowest empty spot.
-         Returns the (row, col) where it landed.
-        """
-        # First, check if the move is allowed
-        allowed_moves = self.get_legal_actions()
-        
-        if column_index not in allowed_moves:
-            return None # Move is not allowed
-
-        # Start looking from the bottom row (5) up to the top row (0)
-        # range(start, stop, step) -> range(5, -1, -1) counts 5, 4, 3, 2, 1, 0
-        for row_index in range(ROWS - 1, -1, -1):
-            
-            # If we find an empty spot
-            if self.board[row_index][column_index] == EMPTY_SLOT:
-                # Place the player's piece there
-                self.board[row_index][column_index] = player_id
-                
-                # Return the exact location where the piece landed
-                return (row_index, column_index)
-        
-        return None # Should not happen if we checked legal actions first
-
-    @staticmethod
-    def check_win(board_data, last_row, last_col, player_id):
-        """
-        Checks if 'player_id' has 4 in a row starting from the last piece placed.
-        """
-        if last_row is None or last_col is None:
-            return False
-
-        # These are the 4 directions we need to check:
-        # (row_change, col_change)
-        directions_to_check = [
-            (1, 0),   # Vertical (Down)
-            (0, 1),   # Horizontal (Right)
-            (1, 1),   # Diagonal (Down-Right)
-            (1, -1)   # Diagonal (Down-Left)
-        ]
-
-        for direction in directions_to_check:
-            # Unpack the direction tuple into two variables
-            row_step = direction[0]
-            col_step = direction[1]
-            
-            count_consecutive_pieces = 1  # Start with 1 (the piece we just placed)
-
-            # 1. Check in the Positive Direction
-            for i in range(1, 4): # Check next 3 spots: 1, 2, 3
-                r = last_row + (row_step * i)
-                c = last_col + (col_step * i)
-
-                # Check if this new coordinate is essentially "on the board"
-                if (0 <= r < ROWS) and (0 <= c < COLS):
-                    # Check if the piece matches the player
-                    if board_data[r][c] == player_id:
-                        count_consecutive_pieces = count_consecutive_pieces + 1
-                    else:
-                        break # Stop counting if we hit a different piece/empty
-                else:
-                    break # Stop if we go off the board boundaries
-
-            # 2. Check in the Negative (Opposite) Direction
-            for i in range(1, 4): 
-                r = last_row - (row_step * i)
-                c = last_col - (col_step * i)
-
-                if (0 <= r < ROWS) and (0 <= c < COLS):
-                    if board_data[r][c] == player_id:
-                        count_consecutive_pieces = count_consecutive_pieces + 1
-                    else:
-                        break
-                else:
-                    break
-            
-            # If we found 4 or more connected pieces in this direction, it's a win
-            if count_consecutive_pieces >= 4:
-                return True
-
-        return False
-
-    @staticmethod
-    def get_legal_actions_for_copy(board_data):
-        """A helper function identical to get_legal_actions but for a copied board."""
-        valid_columns = []
-        for col_index in range(COLS):
-            if board_data[0][col_index] == EMPTY_SLOT:
-                valid_columns.append(col_index)
-        return valid_columns
-
-
-# ==============================================================================
-# SECTION 2: THE AI BRAIN (OPTIMIZED MINIMAX)
-# This uses Alpha-Beta Pruning to be fast.
-# ==============================================================================
-
-class MinimaxAI:
-    def __init__(self):
-        self.max_search_depth = AI_MAX_SEARCH_DEPTH
-        self.current_depth_tracker = 0 
-
-    def get_ai_move(self, current_board_state):
-        """
-        Calculates the best column for the AI to drop a piece.
-        """
-        # Start with the worst possible score for the AI
-        best_score_found = -math.inf
-        best_column_choice = None
-        
-        # Initialize Alpha and Beta for pruning
-        # Alpha: The best score the Maximizer (AI) can guarantee.
-        # Beta: The best score the Minimizer (Human) can guarantee.
-        alpha = -math.inf
-        beta = math.inf
-        
-        # Create a copy of the board so we don't mess up the real game while thinking
-        board_copy = copy.deepcopy(current_board_state)
-        
-        # Get all possible moves
-        possible_moves = ConnectFourBoard.get_legal_actions_for_copy(board_copy)
-        
-        for col in possible_moves:
-            # 1. Simulate making this move
-            r, c = self._simulate_move(board_copy, col, PLAYER_AI_ID)
-            
-            # 2. Use recursion to see how good this move is.
-            # We pass 'False' because after the AI moves, it is the Human's turn (Minimizer).
-            score = self._run_minimax(
-                board=board_copy, 
-                depth=0, 
-                is_maximizing_player=False, 
-                last_pos=(r, c),
-                alpha=alpha,
-                beta=beta
-            )
-            
-            # 3. Undo the move (backtrack) so we can try the next one
-            self._undo_move(board_copy, r, c)
-            
-            # 4. If this move is better than what we found before, keep it
-            if score > best_score_found:
-                best_score_found = score
-                best_column_choice = col
-            
-            # Update Alpha (Optimization)
-            if best_score_found > alpha:
-                alpha = best_score_found
-        
-        return best_column_choice
-
-    # --- Helper Functions ---
-
-    def _simulate_move(self, board_data, col, player_id):
-        """Temporarily places a piece on a board copy."""
-        for r in range(ROWS - 1, -1, -1):
-            if board_data[r][col] == EMPTY_SLOT:
-                board_data[r][col] = player_id
-                return (r, col)
-        return (None, None)
-
-    def _undo_move(self, board_data, row, col):
-        """Removes the piece to reset the board copy."""
-        if row is not None:
-            board_data[row][col] = EMPTY_SLOT
-
-    def _calculate_score(self, board_data, last_pos, player_id):
-        """
-        The Heuristic Function.
-        Decides how good a board state is.
-        """
-        # Access the current depth
-        depth = self.current_depth_tracker
-
-        # 1. Check if someone won
-        did_win = ConnectFourBoard.check_win(board_data, last_pos[0], last_pos[1], player_id)
-        
-        if did_win:
-            if player_id == PLAYER_AI_ID:
-                # AI Won! Return a huge positive number.
-                # We add 'MAX_DEPTH - depth' to prefer winning faster (shallower depth).
-                return SCORE_WIN + (self.max_search_depth - depth)
-            else:
-                # Human Won! Return a huge negative number.
-                # We subtract 'MAX_DEPTH - depth' to prefer losing slower (deeper depth).
-                return -SCORE_WIN - (self.max_search_depth - depth)
-        
-        # 2. If no one won, calculate a positional score
-        score = 0
-        center_column_index = COLS // 2 # The middle column is index 3
-        
-        # Controlling the center is good strategy in Connect 4
-        for r in range(ROWS):
-            piece_at_center = board_data[r][center_column_index]
-            
-            if piece_at_center == PLAYER_AI_ID:
-                score = score + 3  # Points for AI piece in center
-            elif piece_at_center == PLAYER_HUMAN_ID:
-                score = score - 3  # Negative points for Human piece in center
-                
-        return score
-
-    # --- The Main Recursive Function ---
-
-    def _run_minimax(self, board, depth, is_maximizing_player, last_pos, alpha, beta):
-        """
-        The recursive algorithm.
-        is_maximizing_player = True means it is the AI's turn.
-        is_maximizing_player = False means it is the Human's turn.
-        """
-        self.current_depth_tracker = depth 
-
-        # Figure out who made the LAST move that got us here
-        if is_maximizing_player == True:
-            # If it is currently MAX's turn, then MIN (Human) just moved.
-            player_who_just_moved = PLAYER_HUMAN_ID
-        else:
-            # If it is currently MIN's turn, then MAX (AI) just moved.
-            player_who_just_moved = PLAYER_AI_ID
-        
-        # --- STOPPING CONDITIONS (BASE CASES) ---
-        
-        # 1. Check if the game is over (Win/Loss)
-        is_game_over = ConnectFourBoard.check_win(board, last_pos[0], last_pos[1], player_who_just_moved)
-        if is_game_over:
-            return self._calculate_score(board, last_pos, player_who_just_moved)
-
-        # 2. Check if we reached the thinking limit (Depth)
-        if depth == self.max_search_depth:
-            return self._calculate_score(board, last_pos, player_who_just_moved)
-
-        # 3. Check for Draw (Board full)
-        valid_moves = ConnectFourBoard.get_legal_actions_for_copy(board)
-        if len(valid_moves) == 0:
-            return SCORE_DRAW
-        
-        # --- RECURSION STEPS ---
-        
-        if is_maximizing_player: 
-            # AI's Turn: Wants to MAXIMIZE the score
-            max_value = -math.inf
-            
-            for col in valid_moves:
-                r, c = self._simulate_move(board, col, PLAYER_AI_ID)
-                
-                # Recursion: Call self, but increase depth and switch turn to False (Human)
-                current_value = self._run_minimax(board, depth + 1, False, (r, c), alpha, beta)
-                
-                # Keep the highest score found
-                if current_value > max_value:
-                    max_value = current_value
-                
-                self._undo_move(board, r, c)
-                
-                # *** ALPHA-BETA PRUNING ***
-                # Update Alpha (Best MAX path found so far)
-                if max_value > alpha:
-                    alpha = max_value
-                
-                # If Alpha is better than Beta, the Minimizer will never let us get here.
-                # So we stop looking (Prune).
-                if alpha >= beta:
-                    break 
-            
-            return max_value
-            
-        else: 
-            # Human's Turn: Wants to MINIMIZE the score (make it negative)
-            min_value = math.inf
-            
-            for col in valid_moves:
-                r, c = self._simulate_move(board, col, PLAYER_HUMAN_ID)
-                
-                # Recursion: Call self, but increase depth and switch turn to True (AI)
-                current_value = self._run_minimax(board, depth + 1, True, (r, c), alpha, beta)
-                
-                # Keep the lowest score found
-                if current_value < min_value:
-                    min_value = current_value
-                
-                self._undo_move(board, r, c)
-                
-                # *** ALPHA-BETA PRUNING ***
-                # Update Beta (Best MIN path found so far)
-                if min_value < beta:
-                    beta = min_value
-                
-                # If Alpha is better than Beta, the Maximizer has a better option elsewhere.
-                # So we stop looking (Prune).
-                if alpha >= beta:
-                    break
-            
-            return min_value
-
-
-# ==============================================================================
-# SECTION 3: THE USER INTERFACE (GUI)
-# This handles the window, buttons, and mouse clicks using Tkinter.
-# ==============================================================================
-
-class ConnectFourGUI:
-    def __init__(self, root_window):
-        self.master = root_window
-        self.master.title("Connect 4 - AI Project")
-        
-        # Create the logic objects
-        self.board_logic = ConnectFourBoard()
-        self.ai_agent = MinimaxAI() 
-        
-        # Game State Variables
-        self.game_mode = None          # Will be 'AI' or 'Human'
-        self.active_player = PLAYER_HUMAN_ID
-        self.is_game_running = False
-        
-        # Variables to remember the last move (for win checking)
-        self.last_row = None
-        self.last_col = None
-        
-        # A "Lock" variable. This prevents the user from clicking twice 
-        # while the AI is thinking.
-        self.is_processing_move = False 
-
-        # Graphics Settings
-        self.SQUARE_SIZE = 80
-        width_px = COLS * self.SQUARE_SIZE
-        height_px = ROWS * self.SQUARE_SIZE
-        
-        # Create the container frame
-        self.main_frame = tk.Frame(self.master)
-        self.main_frame.pack(pady=10, padx=10)
-        
-        # Start by showing the menu
-        self.show_start_menu()
-
-    def clear_screen(self):
-        """Removes all buttons and text from the screen."""
-        for widget in self.main_frame.winfo_children():
-            widget.destroy()
-
-    def show_start_menu(self):
-        """Shows the two buttons to pick the game mode."""
-        self.clear_screen()
-        
-        # Title Text
-        title = tk.Label(self.main_frame, text="Select Game Mode", font=('Arial', 20, 'bold'))
-        title.pack(pady=30)
-        
-        # Button 1: Human vs AI
-        btn_ai = tk.Button(self.main_frame, text="Human vs. AI", 
-                           command=lambda: self.initialize_game('AI'),
-                           bg='#2196F3', fg='white', font=('Arial', 14, 'bold'), 
-                           width=30, height=2)
-        btn_ai.pack(pady=15)
-                  
-        # Button 2: Human vs Human
-        btn_human = tk.Button(self.main_frame, text="Human vs. Human", 
-                              command=lambda: self.initialize_game('Human'),
-                              bg='#FF9800', fg='white', font=('Arial', 14, 'bold'), 
-                              width=30, height=2)
-        btn_human.pack(pady=15)
-
-    def show_game_board(self):
-        """Sets up the visual board grid."""
-        self.clear_screen()
-        
-        # Create a separate frame for the game elements
-        self.game_frame = tk.Frame(self.main_frame)
-        self.game_frame.pack()
-        
-        # Status Text (e.g. "Player 1 Turn")
-        self.status_label = tk.Label(self.game_frame, text="", font=('Arial', 14))
-        self.status_label.pack(pady=5)
-        
-        # The Canvas is where we draw the circles
-        w = COLS * self.SQUARE_SIZE
-        h = ROWS * self.SQUARE_SIZE
-        self.canvas = tk.Canvas(self.game_frame, width=w, height=h, bg='blue')
-        self.canvas.pack(pady=10)
-        
-        # Connect the mouse click event to our function
-        self.canvas.bind("<Button-1>", self.on_canvas_click)
-        
-        # Restart Button
-        btn_restart = tk.Button(self.game_frame, text="Restart / Change Mode", 
-                                command=self.reset_game, 
-                                bg='#4CAF50', fg='white', font=('Arial', 12, 'bold'))
-        btn_restart.pack(pady=10)
-
-    def initialize_game(self, selected_mode):
-        """Sets up the variables to start a new game."""
-        self.game_mode = selected_mode
-        self.board_logic = ConnectFourBoard() # Reset board data
-        self.active_player = PLAYER_HUMAN_ID
-        self.is_game_running = True
-        self.is_processing_move = False # Unlock the mouse
-        
-        self.show_game_board()
-        
-        if self.game_mode == 'AI':
-            self.status_label.config(text="Human (Red) vs. AI (Yellow). Your Turn!")
-        else:
-            self.status_label.config(text="Player 1 (Red) vs. Player 2 (Yellow). P1's Turn!")
-
-        self.redraw_graphics()
-
-    def redraw_graphics(self):
-        """Erases the canvas and redraws all circles based on board data."""
-        self.canvas.delete("all")
-        
-        # Loop through every cell in the grid
-        for r in range(ROWS):
-            for c in range(COLS):
-                # Calculate pixel coordinates
-                x1 = c * self.SQUARE_SIZE
-                y1 = r * self.SQUARE_SIZE
-                x2 = x1 + self.SQUARE_SIZE
-                y2 = y1 + self.SQUARE_SIZE
-                
-                # Draw the blue background circle (the empty hole look)
-                self.canvas.create_oval(x1 + 5, y1 + 5, x2 - 5, y2 - 5, 
-                                        fill="lightblue", outline="darkblue")
-                
-                # Check who owns this spot
-                piece_id = self.board_logic.board[r][c]
-                
-                color_to_fill = None
-                if piece_id == PLAYER_HUMAN_ID:
-                    color_to_fill = "red"
-                elif piece_id == PLAYER_AI_ID:
-                    color_to_fill = "yellow"
-                
-                # If there is a piece, draw it on top
-                if color_to_fill is not None:
-                    self.canvas.create_oval(x1 + 5, y1 + 5, x2 - 5, y2 - 5, 
-                                            fill=color_to_fill, outline="black", width=2)
-
-    def on_canvas_click(self, event):
-        """This runs when the user clicks the mouse on the board."""
-        
-        # --- BUG FIX: INPUT LOCK ---
-        # If the game is over OR the computer is currently thinking, ignore the click.
-        if self.is_game_running == False:
-            return
-        if self.is_processing_move == True:
-            return
-            
-        # Lock the input so the user can't click again immediately
-        self.is_processing_move = True 
-
-        # Figure out which column was clicked
-        pixel_x = event.x
-        column_clicked = pixel_x // self.SQUARE_SIZE
-        
-        # Check if this column is valid
-        legal_moves = self.board_logic.get_legal_actions()
-        
-        if column_clicked in legal_moves:
-            # 1. Perform the Human's Move
-            result = self.board_logic.make_move(column_clicked, self.active_player)
-            
-            # Store the row and col for checking wins
-            self.last_row = result[0]
-            self.last_col = result[1]
-            
-            self.redraw_graphics()
-            
-            # 2. Check if Human Won
-            game_ended = self.check_game_over(self.active_player)
-            if game_ended == True:
-                self.is_processing_move = False # Unlock so they can click restart
-                return
-            
-            # 3. Switch Turns
-            if self.game_mode == 'Human':
-                # Logic for 2-Player Mode
-                if self.active_player == PLAYER_HUMAN_ID:
-                    self.active_player = PLAYER_AI_ID # Player 2
-                    name = "Player 2 (Yellow)"
-                else:
-                    self.active_player = PLAYER_HUMAN_ID # Player 1
-                    name = "Player 1 (Red)"
-                
-                self.status_label.config(text=f"{name}'s Turn")
-                self.is_processing_move = False # Unlock immediately for next human
-            
-            elif self.game_mode == 'AI':
-                # Logic for AI Mode
-                self.active_player = PLAYER_AI_ID
-                self.status_label.config(text="AI is Thinking...")
-                
-                # Force the window to update so the text shows up
-                self.master.update() 
-                
-                # Run the AI logic after a tiny delay (100ms) so graphics update first
-                self.master.after(100, self.run_ai_turn) 
-        else:
-            # If they clicked a full column, just unlock and let them try again
-            self.is_processing_move = False 
-
-
-    def check_game_over(self, player_id):
-        """Checks for Win or Draw. Returns True if game ended."""
-        # Check Win
-        has_won = ConnectFourBoard.check_win(self.board_logic.board, self.last_row, self.last_col, player_id)
-        
-        if has_won:
-            winner_text = ""
-            if self.game_mode == 'AI':
-                if player_id == PLAYER_AI_ID:
-                    winner_text = "AI Player (Yellow) Wins!"
-                else:
-                    winner_text = "Human Player (Red) Wins!"
-            else:
-                if player_id == PLAYER_HUMAN_ID:
-                    winner_text = "Player 1 (Red) Wins!"
-                else:
-                    winner_text = "Player 2 (Yellow) Wins!"
-            
-            self.trigger_game_over(winner_text)
-            return True
-
-        # Check Draw (No legal moves left)
-        available = self.board_logic.get_legal_actions()
-        if len(available) == 0:
-            self.trigger_game_over("It's a Draw!")
-            return True
-            
-        return False
-
-    def run_ai_turn(self):
-        """This function runs the AI logic."""
-        # Double check lock
-        if self.is_game_running == False:
-            self.is_processing_move = False
-            return
-
-        # 1. Ask Minimax for the best column
-        # We send a copy of the board data
-        board_data_copy = [row[:] for row in self.board_logic.board] 
-        best_col = self.ai_agent.get_ai_move(board_data_copy)
-        
-        # 2. Make the AI move
-        result = self.board_logic.make_move(best_col, PLAYER_AI_ID)
-        self.last_row = result[0]
-        self.last_col = result[1]
-        
-        self.redraw_graphics()
-        
-        # 3. Check if AI won
-        game_ended = self.check_game_over(PLAYER_AI_ID)
-        if game_ended:
-            self.is_processing_move = False
-            return
-            
-        # 4. Switch back to Human
-        self.active_player = PLAYER_HUMAN_ID
-        self.status_label.config(text="Your Turn (Red)")
-        
-        # CRITICAL: Unlock the input now that AI is done
-        self.is_processing_move = False 
-        
-    def trigger_game_over(self, message_text):
-        """Freezes the game and shows a popup."""
-        self.is_game_running = False
-        self.status_label.config(text=message_text, fg='red', font=('Arial', 16, 'bold'))
-        messagebox.showinfo("Game Over", message_text)
-
-    def reset_game(self):
-        """Goes back to the start menu."""
-        self.is_game_running = False
-        self.game_mode = None
-        self.is_processing_move = False
-        self.show_start_menu()
-
-
-# ==============================================================================
-# MAIN EXECUTION
-# This block runs when you double-click the python file.
-# ==============================================================================
-if __name__ == '__main__':
-    # Create the main window
-    main_window = tk.Tk()
-    
-    # Start the game logic
-    game_app = ConnectFourGUI(main_window)
-    
-    # Keep the window open
-    main_window.mainloop()
\ No newline at end of file
+import tkinter as tk
+from tkinter import messagebox
+import os
+import pickle
+import queue
+import random
+import threading
+
+# ==============================================================================
+# SECTION 0: CONFIGURATION (CONSTANTS)
+# These variables do not change during the game.
+# ==============================================================================
+
+# The board size (Integers)
+ROWS = 6
+COLS = 7
+
+# Codes for the pieces on the board (Integers)
+# We use numbers because they are easy to store in a list.
+EMPTY_SLOT = 0
+PLAYER_HUMAN_ID = 1  # Red piece
+PLAYER_AI_ID = 2     # Yellow piece
+
+# AI Configuration
+# 7 is deep enough to be smart, but fast thanks to optimization.
+AI_MAX_SEARCH_DEPTH = 7
+
+# Scoring values (Integers)
+SCORE_WIN = 1000000
+SCORE_DRAW = 0
+
+# "Infinity" for the alpha-beta window. A plain int comfortably above any
+# reachable score: mixing float('inf') into the comparisons would silently
+# promote every score test to float arithmetic.
+INF = 10 ** 9
+
+# Half-width of the "aspiration window": each deepening pass first searches a
+# narrow window around the previous pass's score instead of (-INF, INF), and
+# only widens if the true score falls outside it.
+ASPIRATION_WINDOW = 50
+
+# --- Bitboard Layout ---
+# Instead of a list of lists, we store the whole board inside one big integer
+# (a "bitboard"). Each column gets 7 bits: 6 playable cells plus 1 padding bit
+# on top. The padding stops a vertical line in one column from "leaking" into
+# the next column when we shift bits around.
+#
+# Bit number for a cell = (column * 7) + row_counted_from_the_bottom
+#
+#   col 0     col 1    ...
+#   bit 6*    bit 13*       (* = padding bit, never occupied)
+#   bit 5     bit 12        (top playable row)
+#   ...       ...
+#   bit 0     bit 7         (bottom row)
+COLUMN_HEIGHT = ROWS + 1  # 7 bits per column (6 cells + 1 padding bit)
+
+# A bitboard with just the bottom cell of every column set.
+BOTTOM_ROW_MASK = 0
+for _c in range(COLS):
+    BOTTOM_ROW_MASK = BOTTOM_ROW_MASK | (1 << (_c * COLUMN_HEIGHT))
+
+# A bitboard with every playable cell set (the padding bits stay 0).
+BOARD_MASK = BOTTOM_ROW_MASK * ((1 << ROWS) - 1)
+
+# Handy per-column masks, looked up by column index.
+COLUMN_BOTTOM = []  # the lowest cell of the column
+COLUMN_TOP = []     # the highest PLAYABLE cell of the column
+COLUMN_MASK = []    # all playable cells of the column
+for _c in range(COLS):
+    COLUMN_BOTTOM.append(1 << (_c * COLUMN_HEIGHT))
+    COLUMN_TOP.append(1 << (_c * COLUMN_HEIGHT + ROWS - 1))
+    COLUMN_MASK.append(((1 << ROWS) - 1) << (_c * COLUMN_HEIGHT))
+
+# The order the AI tries columns in: centre first, edges last.
+# Centre columns take part in the most possible 4-in-a-row lines, so trying
+# them first finds good moves early and lets Alpha-Beta prune the rest.
+MOVE_ORDER = (3, 4, 2, 5, 1, 6, 0)
+
+# --- Evaluation Windows ---
+# Every possible 4-in-a-row line on the board ("window"), precomputed once as
+# a 4-bit mask. There are 24 horizontal + 21 vertical + 12 + 12 diagonal = 69.
+# The heuristic scores a position by looking at who occupies each window.
+def _window_mask(start_col, start_row, col_step, row_step):
+    mask = 0
+    for i in range(4):
+        col = start_col + (col_step * i)
+        row = start_row + (row_step * i)
+        mask = mask | (1 << (col * COLUMN_HEIGHT + row))
+    return mask
+
+ALL_WINDOWS = []
+for _c in range(COLS):
+    for _r in range(ROWS):
+        if _r <= ROWS - 4:                      # vertical (upwards)
+            ALL_WINDOWS.append(_window_mask(_c, _r, 0, 1))
+        if _c <= COLS - 4:                      # horizontal (rightwards)
+            ALL_WINDOWS.append(_window_mask(_c, _r, 1, 0))
+        if _c <= COLS - 4 and _r <= ROWS - 4:   # diagonal (up-right)
+            ALL_WINDOWS.append(_window_mask(_c, _r, 1, 1))
+        if _c <= COLS - 4 and _r >= 3:          # diagonal (down-right)
+            ALL_WINDOWS.append(_window_mask(_c, _r, 1, -1))
+
+# --- Zobrist Hashing ---
+# Every (player, cell) pair gets its own random 64-bit number. The hash of a
+# position is simply all the numbers of the pieces on the board XOR-ed
+# together. Because XOR undoes itself, placing or removing a piece only needs
+# ONE extra XOR instead of re-hashing the whole board.
+# A fixed seed keeps the numbers the same on every run.
+_zobrist_rng = random.Random(0xC4C4C4)
+ZOBRIST = []
+for _p in range(2):
+    player_table = []
+    for _bit in range(COLS * COLUMN_HEIGHT):
+        player_table.append(_zobrist_rng.getrandbits(64))
+    ZOBRIST.append(player_table)
+
+# A second Zobrist table for the MIRRORED board: entry for a cell holds the
+# random number of the left-right reflected cell (column c -> column 6-c).
+# Keeping a second incremental hash with this table gives us the hash of the
+# mirror image of the current position for free. Connect 4 is symmetric, so a
+# position and its mirror have the same value and can share one table entry.
+ZOBRIST_MIRROR = []
+for _p in range(2):
+    player_table = []
+    for _bit in range(COLS * COLUMN_HEIGHT):
+        _col = _bit // COLUMN_HEIGHT
+        _row = _bit % COLUMN_HEIGHT
+        player_table.append(ZOBRIST[_p][(COLS - 1 - _col) * COLUMN_HEIGHT + _row])
+    ZOBRIST_MIRROR.append(player_table)
+
+# Flags for transposition table entries. They record whether the stored value
+# is the true score (EXACT) or only a bound (the search was cut off early).
+TT_EXACT = 0
+TT_LOWER = 1  # real score is >= stored value (a beta cutoff happened)
+TT_UPPER = 2  # real score is <= stored value (no move beat alpha)
+
+
+# ==============================================================================
+# SECTION 1: THE BOARD LOGIC (GAME RULES)
+# This class handles the data and rules of Connect 4.
+# ==============================================================================
+
+def legal_moves_bb(mask):
+    """
+    Returns a bitboard holding the LANDING cell of every non-full column,
+    for all 7 columns at once. Adding the bottom-row bits to the mask makes
+    the carry in each column ripple up to its first free cell; full columns
+    overflow into their padding bit, which BOARD_MASK throws away.
+    """
+    return (mask + BOTTOM_ROW_MASK) & BOARD_MASK
+
+
+def mirror_bb(bb):
+    """Returns the left-right reflection of a bitboard (column c -> 6-c)."""
+    mirrored = 0
+    for col in range(COLS):
+        column_bits = (bb >> (col * COLUMN_HEIGHT)) & ((1 << COLUMN_HEIGHT) - 1)
+        mirrored = mirrored | (column_bits << ((COLS - 1 - col) * COLUMN_HEIGHT))
+    return mirrored
+
+
+def winning_spots(bb, mask):
+    """
+    Returns a bitboard of every EMPTY cell that would complete 4-in-a-row for
+    the player whose pieces are in 'bb'. For each direction it combines the
+    four ways a cell can finish a line (_XXX, X_XX, XX_X, XXX_) with shifts.
+    """
+    # Vertical: three own pieces directly below the empty cell
+    spots = (bb << 1) & (bb << 2) & (bb << 3)
+
+    # Horizontal and both diagonals
+    for shift in (COLUMN_HEIGHT - 1, COLUMN_HEIGHT, COLUMN_HEIGHT + 1):
+        pair = (bb << shift) & (bb << (2 * shift))
+        spots = spots | (pair & (bb << (3 * shift)))  # cell at the right end
+        spots = spots | (pair & (bb >> shift))        # cell second from right
+        pair = (bb >> shift) & (bb >> (2 * shift))
+        spots = spots | (pair & (bb >> (3 * shift)))  # cell at the left end
+        spots = spots | (pair & (bb << shift))        # cell second from left
+
+    # Keep only cells that are actually on the board and still empty
+    return spots & (BOARD_MASK ^ mask)
+
+
+def connected_four(bb):
+    """
+    Returns True if the bitboard 'bb' (one player's pieces) contains
+    4 in a row in any direction. This is the hottest function in the whole
+    program - the minimax search calls it at every single node - so it is
+    kept as a handful of shift-and-AND operations.
+    """
+    # Vertical (cells in a column are 1 bit apart).
+    # bb & (bb >> 1) marks every cell with a friendly piece directly above it;
+    # AND-ing that with itself shifted by 2 finds two such pairs = 4 in a row.
+    m = bb & (bb >> 1)
+    if m & (m >> 2):
+        return True
+
+    # Horizontal (cells in a row are 7 bits apart)
+    m = bb & (bb >> COLUMN_HEIGHT)
+    if m & (m >> (2 * COLUMN_HEIGHT)):
+        return True
+
+    # Diagonal going down-right (6 bits apart)
+    m = bb & (bb >> (COLUMN_HEIGHT - 1))
+    if m & (m >> (2 * (COLUMN_HEIGHT - 1))):
+        return True
+
+    # Diagonal going up-right (8 bits apart)
+    m = bb & (bb >> (COLUMN_HEIGHT + 1))
+    return bool(m & (m >> (2 * (COLUMN_HEIGHT + 1))))
+
+
+class ConnectFourBoard:
+    def __init__(self):
+        # Two bitboards, one per player:
+        #   self.bitboards[0] -> cells owned by Player 1 (Human / Red)
+        #   self.bitboards[1] -> cells owned by Player 2 (AI / Yellow)
+        # self.mask is simply both of them OR-ed together (every occupied cell).
+        self.bitboards = [0, 0]
+        self.mask = 0
+
+    def get_legal_actions(self):
+        """
+        Returns a list of column numbers where a player is allowed to drop a piece.
+        A column is legal if its top playable cell is still empty.
+        """
+        valid_columns = []
+        playable = legal_moves_bb(self.mask)
+
+        # Loop through every column index from 0 to 6
+        for col_index in range(COLS):
+            # The column is legal if it still has a landing cell
+            if playable & COLUMN_MASK[col_index]:
+                valid_columns.append(col_index)
+
+        return valid_columns
+
+    def make_move(self, column_index, player_id):
+        """
+         drops a piece into a column. It falls to the lowest empty spot.
+         Returns the (row, col) where it landed.
+        """
+        # First, check if the column has room (single bit test)
+        if self.mask & COLUMN_TOP[column_index]:
+            return None # Move is not allowed
+
+        # Bitboard trick: adding the column's bottom bit to the mask makes the
+        # carry ripple up past the occupied cells and land exactly on the first
+        # empty cell of that column. Masking with the column keeps only that bit.
+        move_bit = (self.mask + COLUMN_BOTTOM[column_index]) & COLUMN_MASK[column_index]
+
+        # Place the piece by setting the bit on the player's board and the mask
+        self.bitboards[player_id - 1] = self.bitboards[player_id - 1] | move_bit
+        self.mask = self.mask | move_bit
+
+        # Convert the bit position back to (row, col) for the GUI.
+        # bit_length() - 1 gives us the bit's index inside the big integer.
+        bit_index = move_bit.bit_length() - 1
+        row_from_bottom = bit_index - (column_index * COLUMN_HEIGHT)
+        row_index = ROWS - 1 - row_from_bottom
+
+        return (row_index, column_index)
+
+    def check_win(self, player_id):
+        """
+        Checks if 'player_id' has 4 in a row anywhere on the board.
+        """
+        return connected_four(self.bitboards[player_id - 1])
+
+    def piece_at(self, row_index, column_index):
+        """
+        Tells the GUI who owns the cell at (row, col).
+        Row 0 is the TOP of the window, but bit 0 of a column is the BOTTOM
+        of the board, so we flip the row before building the bit.
+        """
+        row_from_bottom = ROWS - 1 - row_index
+        cell_bit = 1 << (column_index * COLUMN_HEIGHT + row_from_bottom)
+
+        if self.bitboards[0] & cell_bit:
+            return PLAYER_HUMAN_ID
+        if self.bitboards[1] & cell_bit:
+            return PLAYER_AI_ID
+        return EMPTY_SLOT
+
+    @staticmethod
+    def get_legal_actions_for_copy(mask):
+        """
+        Like get_legal_actions but for a raw mask, and returned in MOVE_ORDER
+        (centre columns first) because the AI searches them in this order.
+        """
+        playable = legal_moves_bb(mask)
+        return [col_index for col_index in MOVE_ORDER if playable & COLUMN_MASK[col_index]]
+
+
+# ==============================================================================
+# SECTION 2: THE AI BRAIN (OPTIMIZED MINIMAX)
+# This uses Alpha-Beta Pruning to be fast.
+# ==============================================================================
+
+class MinimaxAI:
+    def __init__(self):
+        self.max_search_depth = AI_MAX_SEARCH_DEPTH
+
+        # The depth limit of the CURRENT iterative-deepening pass.
+        # Grows from 1 up to max_search_depth inside get_ai_move.
+        self.depth_limit = AI_MAX_SEARCH_DEPTH
+
+        # The Transposition Table: remembers positions we already analysed.
+        # Different move orders often reach the SAME position ("transpositions"),
+        # so caching results prunes huge parts of the tree.
+        # Key: Zobrist hash. Value: (depth_remaining, value, flag, best_move).
+        self.transposition_table = {}
+
+        # The Zobrist hash of the position the search is currently looking at,
+        # plus the hash of its left-right mirror image. Both are updated
+        # incrementally; the smaller of the two is used as the table key, so a
+        # position and its mirror collapse into one entry.
+        self.zobrist_hash = 0
+        self.zobrist_hash_mirror = 0
+
+        # Killer moves: for each depth, the last two columns that caused a
+        # cutoff at that depth. A move that refuted one sibling position very
+        # often refutes the others too, so these are tried early.
+        self.killers = [[None, None] for _ in range(AI_MAX_SEARCH_DEPTH + 1)]
+
+        # The opening book: precomputed answers for early-game positions,
+        # built offline by build_opening_book.py. Playing without the file is
+        # fine - the AI just searches those positions like any other.
+        self.opening_book = {}
+        book_path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "opening_book.pkl")
+        try:
+            with open(book_path, 'rb') as book_file:
+                self.opening_book = pickle.load(book_file)
+        except (OSError, pickle.UnpicklingError):
+            pass # No book available; not a problem
+
+    def get_ai_move(self, current_board_state):
+        """
+        Calculates the best column for the AI to drop a piece.
+        """
+        best_column_choice = None
+
+        # Think directly on the live board. No copy is needed: every
+        # _play below is paired with an _undo_move, so the board is
+        # guaranteed to be back in its original state when we return.
+        board = current_board_state
+
+        # Remember the exact state so we can verify that promise at the end
+        state_before = (board.bitboards[0], board.bitboards[1], board.mask)
+
+        # Forget results from previous turns (their depth bookkeeping is stale)
+        # and hash the starting position once; after this the hash is kept
+        # up to date move-by-move.
+        self.transposition_table.clear()
+        self.zobrist_hash, self.zobrist_hash_mirror = self._compute_zobrist(board)
+        self.killers = [[None, None] for _ in range(self.max_search_depth + 1)]
+
+        # --- OPENING BOOK ---
+        # Early positions were solved once, offline; answering from the book
+        # costs one dictionary lookup instead of a full search. The book is
+        # stored in the canonical (mirror-folded) orientation like the TT.
+        if self.opening_book:
+            if self.zobrist_hash <= self.zobrist_hash_mirror:
+                book_move = self.opening_book.get(self.zobrist_hash)
+            else:
+                book_move = self.opening_book.get(self.zobrist_hash_mirror)
+                if book_move is not None:
+                    book_move = COLS - 1 - book_move
+            if book_move is not None and (board.mask & COLUMN_TOP[book_move]) == 0:
+                return book_move
+
+        # Get all possible moves
+        possible_moves = ConnectFourBoard.get_legal_actions_for_copy(board.mask)
+
+        # If the position is its own mirror image (true for the empty board
+        # and for any symmetric position), columns 4..6 are just reflections
+        # of columns 0..2, so searching them would repeat identical work.
+        if (board.bitboards[0] == mirror_bb(board.bitboards[0])
+                and board.bitboards[1] == mirror_bb(board.bitboards[1])):
+            possible_moves = [c for c in possible_moves if c <= COLS // 2]
+
+        # The landing cell of every root move, computed once; the board always
+        # returns to this state after each play/undo pair below.
+        root_legal_bb = legal_moves_bb(board.mask)
+
+        # --- ITERATIVE DEEPENING ---
+        # Instead of jumping straight to the full depth, search depth 1, then
+        # depth 2, and so on. This sounds wasteful but is actually FASTER:
+        # each shallow pass fills the transposition table and tells us which
+        # move is probably best, so the next (much bigger) pass tries the best
+        # move first and prunes far more of the tree.
+        previous_score = None
+
+        for current_limit in range(1, self.max_search_depth + 1):
+            self.depth_limit = current_limit
+
+            # Order the root moves: last iteration's best move first.
+            # possible_moves already comes back centre-out (MOVE_ORDER).
+            ordered_moves = list(possible_moves)
+            if best_column_choice in ordered_moves:
+                ordered_moves.remove(best_column_choice)
+                ordered_moves.insert(0, best_column_choice)
+
+            # --- ASPIRATION WINDOW ---
+            # The score rarely changes much from one depth to the next, so
+            # start with a narrow window around the previous pass's score.
+            # A narrow window prunes far more; the price is that a score
+            # landing OUTSIDE it is only a bound, forcing a wider re-search.
+            if previous_score is None:
+                search_alpha = -INF
+                search_beta = INF
+            else:
+                search_alpha = previous_score - ASPIRATION_WINDOW
+                search_beta = previous_score + ASPIRATION_WINDOW
+
+            while True:
+                # Start with the worst possible score for the AI
+                best_score_found = -INF
+                best_this_iteration = None
+
+                # Initialize Alpha and Beta for pruning
+                # Alpha: The best score the Maximizer (AI) can guarantee.
+                # Beta: The best score the Minimizer (Human) can guarantee.
+                alpha = search_alpha
+                beta = search_beta
+
+                for col in ordered_moves:
+                    # 1. Simulate making this move (the landing bit is one AND away)
+                    move_bit = root_legal_bb & COLUMN_MASK[col]
+                    self._play(board, move_bit, PLAYER_AI_ID)
+
+                    # 2. Use recursion to see how good this move is.
+                    # The kernel works on the three raw integers of the position
+                    # and scores from the MOVER's point of view (negamax), so the
+                    # Human replies next, the window is flipped, and the result
+                    # is negated back into the AI's point of view.
+                    score = -self._run_minimax(
+                        mask=board.mask,
+                        current_bb=board.bitboards[PLAYER_HUMAN_ID - 1],
+                        opponent_bb=board.bitboards[PLAYER_AI_ID - 1],
+                        mover_id=PLAYER_HUMAN_ID,
+                        depth=0,
+                        alpha=-beta,
+                        beta=-alpha
+                    )
+
+                    # 3. Undo the move (backtrack) so we can try the next one
+                    self._undo_move(board, move_bit, PLAYER_AI_ID)
+
+                    # 4. If this move is better than what we found before, keep it
+                    if score > best_score_found:
+                        best_score_found = score
+                        best_this_iteration = col
+
+                    # Update Alpha (Optimization)
+                    if best_score_found > alpha:
+                        alpha = best_score_found
+
+                # Fail low: the real score is below the window, so every move
+                # came back as a mere upper bound. Re-search with no floor.
+                if best_score_found <= search_alpha and search_alpha > -INF:
+                    search_alpha = -INF
+                    continue
+
+                # Fail high: the best score is only a lower bound. Re-search
+                # with no ceiling to find the true score and best move.
+                if best_score_found >= search_beta and search_beta < INF:
+                    search_beta = INF
+                    continue
+
+                break
+
+            # Remember this pass's answer; it seeds the next, deeper pass
+            previous_score = best_score_found
+            best_column_choice = best_this_iteration
+
+        # Safety net: make sure the make/unmake pairs really cancelled out
+        # and we are handing the board back exactly as we received it.
+        assert state_before == (board.bitboards[0], board.bitboards[1], board.mask), \
+            "AI search left the board in a modified state"
+
+        return best_column_choice
+
+    # --- Helper Functions ---
+
+    def _compute_zobrist(self, board):
+        """
+        Hashes a whole position from scratch (only needed once per turn).
+        Returns both the normal hash and the hash of the mirrored position.
+        """
+        hash_value = 0
+        hash_value_mirror = 0
+        for player_index in range(2):
+            bb = board.bitboards[player_index]
+            # Peel off the set bits one at a time, lowest first
+            while bb:
+                lowest_bit = bb & -bb
+                bit_index = lowest_bit.bit_length() - 1
+                hash_value = hash_value ^ ZOBRIST[player_index][bit_index]
+                hash_value_mirror = hash_value_mirror ^ ZOBRIST_MIRROR[player_index][bit_index]
+                bb = bb ^ lowest_bit
+        return hash_value, hash_value_mirror
+
+    def _play(self, board, move_bit, player_id):
+        """
+        Temporarily drops a piece while the AI is thinking. The caller
+        supplies the landing bit (it already has it from legal_moves_bb),
+        so there is nothing to compute or return here.
+        """
+        board.bitboards[player_id - 1] = board.bitboards[player_id - 1] | move_bit
+        board.mask = board.mask | move_bit
+
+        # Keep both Zobrist hashes in sync: one XOR each per placed piece
+        bit_index = move_bit.bit_length() - 1
+        self.zobrist_hash = self.zobrist_hash ^ ZOBRIST[player_id - 1][bit_index]
+        self.zobrist_hash_mirror = self.zobrist_hash_mirror ^ ZOBRIST_MIRROR[player_id - 1][bit_index]
+
+    def _undo_move(self, board, move_bit, player_id):
+        """Removes the piece again. XOR simply flips the played bit back off."""
+        board.bitboards[player_id - 1] = board.bitboards[player_id - 1] ^ move_bit
+        board.mask = board.mask ^ move_bit
+
+        # The same XORs also take the piece back OUT of the hashes
+        bit_index = move_bit.bit_length() - 1
+        self.zobrist_hash = self.zobrist_hash ^ ZOBRIST[player_id - 1][bit_index]
+        self.zobrist_hash_mirror = self.zobrist_hash_mirror ^ ZOBRIST_MIRROR[player_id - 1][bit_index]
+
+    def _calculate_score(self, ai_bb, human_bb):
+        """
+        The Heuristic Function.
+        Decides how good a (non-terminal) board state is. Wins and losses are
+        scored directly inside _run_minimax, so this only rates positions.
+        """
+        score = 0
+
+        # Look at every possible 4-in-a-row line ("window") on the board.
+        # A window that contains pieces of BOTH players can never be completed
+        # by either of them, so it is worth nothing. Letting the opponent keep
+        # a 3-piece window is punished much harder than owning one is rewarded,
+        # which makes the AI block threats it cannot see to the end of.
+        for window in ALL_WINDOWS:
+            ai_in_window = (ai_bb & window).bit_count()
+            human_in_window = (human_bb & window).bit_count()
+
+            if ai_in_window and human_in_window:
+                continue # Dead window, blocked for both players
+
+            if ai_in_window == 3:
+                score = score + 1     # One move away from winning
+            elif human_in_window == 3:
+                score = score - 100   # The Human is one move away - very bad
+
+        # Controlling the center is good strategy in Connect 4.
+        # bit_count() counts how many pieces each player has in the center column.
+        center_mask = COLUMN_MASK[COLS // 2]
+        ai_center_pieces = (ai_bb & center_mask).bit_count()
+        human_center_pieces = (human_bb & center_mask).bit_count()
+
+        score = score + (3 * ai_center_pieces)   # Points for AI pieces in center
+        score = score - (3 * human_center_pieces) # Negative points for Human pieces
+
+        return score
+
+    # --- The Main Recursive Function ---
+
+    def _run_minimax(self, mask, current_bb, opponent_bb, mover_id, depth, alpha, beta):
+        """
+        The recursive algorithm - the "kernel" of the AI, in NEGAMAX form.
+
+        Scores are always from the point of view of the player whose turn it
+        is ('mover_id', whose pieces are 'current_bb'). A position that is
+        good for me is exactly as bad for you, so instead of separate
+        maximizing/minimizing branches there is ONE loop that negates the
+        child's score and flips the (alpha, beta) window at every call.
+
+        It works on three plain integers (the occupancy mask and the two
+        player bitboards) instead of a board object. Because Python ints are
+        immutable values, "making a move" is just passing 'mask | move_bit'
+        down the recursive call - the caller's own variables are untouched,
+        so there is nothing to undo on the way back up.
+        """
+        # CPython detail: reading a global or an attribute costs several
+        # bytecodes every single time, while a plain local costs one. These
+        # names are touched once or more per child move, so bind them to
+        # locals up front. ZOBRIST is also pre-indexed by the mover here,
+        # hoisting that lookup out of the move loop entirely.
+        _inf = INF
+        _column_mask = COLUMN_MASK
+        _mover_zobrist = ZOBRIST[mover_id - 1]
+        _mover_zobrist_mirror = ZOBRIST_MIRROR[mover_id - 1]
+        _search = self._run_minimax
+        _tt = self.transposition_table
+
+        # --- STOPPING CONDITIONS (BASE CASES) ---
+
+        # 1. Check if the game is over (Win/Loss).
+        # Only the OPPONENT can have just completed a line, and from the
+        # mover's point of view that is a loss. 'MAX_DEPTH - depth' makes the
+        # search prefer winning sooner and losing later.
+        if connected_four(opponent_bb):
+            return -SCORE_WIN - (self.max_search_depth - depth)
+
+        # 2. Check if we reached the thinking limit (Depth).
+        # The heuristic rates positions for the AI, so negate it when the
+        # mover is the Human.
+        if depth == self.depth_limit:
+            if mover_id == PLAYER_AI_ID:
+                return self._calculate_score(current_bb, opponent_bb)
+            else:
+                return -self._calculate_score(opponent_bb, current_bb)
+
+        # 3. Check for Draw (Board full)
+        # One add-and-mask gives the landing cell of every playable column;
+        # picking a move later is then a single AND per column, no carry trick.
+        legal_bb = legal_moves_bb(mask)
+        if legal_bb == 0:
+            return SCORE_DRAW
+
+        # --- TACTICAL SHORTCUTS ---
+        # 4a. If the mover can complete 4-in-a-row right now, the value is
+        # known without any recursion. (Same score a child visit would return.)
+        if winning_spots(current_bb, mask) & legal_bb:
+            return SCORE_WIN + (self.max_search_depth - depth - 1)
+
+        # 4b. If the OPPONENT could complete 4-in-a-row on their next move,
+        # the mover's hand is forced.
+        killer_slot = self.killers[depth]
+        opponent_threats = winning_spots(opponent_bb, mask) & legal_bb
+        if opponent_threats:
+            if opponent_threats & (opponent_threats - 1):
+                # Two or more playable threats: we can only block one. Lost.
+                return -SCORE_WIN - (self.max_search_depth - depth - 2)
+            # Exactly one threat: the blocking column is the only move worth
+            # looking at, which shrinks this node's branching factor to 1.
+            valid_moves = [(opponent_threats.bit_length() - 1) // COLUMN_HEIGHT]
+        else:
+            valid_moves = [c for c in MOVE_ORDER if legal_bb & _column_mask[c]]
+
+            # Killer moves for this depth go to the front (second killer first,
+            # so that after both inserts the most recent killer is tried first).
+            # The transposition-table move, if any, is pushed in front of them below.
+            for killer in (killer_slot[1], killer_slot[0]):
+                if killer is not None and killer in valid_moves:
+                    valid_moves.remove(killer)
+                    valid_moves.insert(0, killer)
+
+        # --- TRANSPOSITION TABLE: PROBE ---
+        # Maybe we already analysed this exact position (reached through a
+        # different move order) at least as deeply as we are about to.
+        remaining_depth = self.depth_limit - depth
+        alpha_original = alpha
+        beta_original = beta
+
+        # The canonical key is the smaller of the two hashes, so this position
+        # and its mirror image land on the same entry. When the MIRROR hash is
+        # the key, any column stored in (or read from) the entry has to be
+        # reflected to match the orientation we are actually searching.
+        if self.zobrist_hash <= self.zobrist_hash_mirror:
+            tt_key = self.zobrist_hash
+            tt_is_mirrored = False
+        else:
+            tt_key = self.zobrist_hash_mirror
+            tt_is_mirrored = True
+
+        entry = _tt.get(tt_key)
+        if entry is not None:
+            entry_depth, entry_value, entry_flag = entry[0], entry[1], entry[2]
+            if entry_depth >= remaining_depth:
+                if entry_flag == TT_EXACT:
+                    return entry_value
+                elif entry_flag == TT_LOWER and entry_value > alpha:
+                    alpha = entry_value  # tighten the window from below
+                elif entry_flag == TT_UPPER and entry_value < beta:
+                    beta = entry_value   # tighten the window from above
+                if alpha >= beta:
+                    return entry_value
+
+            # Even a too-shallow entry knows which move looked best last time.
+            # Trying that move first makes the pruning below far more effective.
+            tt_move = entry[3]
+            if tt_is_mirrored:
+                tt_move = COLS - 1 - tt_move
+            if tt_move in valid_moves:
+                valid_moves.remove(tt_move)
+                valid_moves.insert(0, tt_move)
+
+        # --- RECURSION STEPS (Principal Variation Search) ---
+        # The first move on the list is almost certainly the best one thanks
+        # to the ordering above, so it gets the full (alpha, beta) window.
+        # Every later move only has to PROVE it is not better, which a
+        # minimal "null window" (alpha, alpha + 1) does much more cheaply.
+        # Only if that quick test fails high do we pay for a real re-search.
+
+        node_value = -_inf
+        best_move_col = valid_moves[0]
+        opponent_id = PLAYER_HUMAN_ID if mover_id == PLAYER_AI_ID else PLAYER_AI_ID
+        is_first_child = True
+
+        for col in valid_moves:
+            # The landing cell was already computed for all columns at
+            # once; keep the Zobrist hash in step with the move
+            move_bit = legal_bb & _column_mask[col]
+            bit_index = move_bit.bit_length() - 1
+            zobrist_bit = _mover_zobrist[bit_index]
+            zobrist_bit_mirror = _mover_zobrist_mirror[bit_index]
+            self.zobrist_hash = self.zobrist_hash ^ zobrist_bit
+            self.zobrist_hash_mirror = self.zobrist_hash_mirror ^ zobrist_bit_mirror
+
+            child_mask = mask | move_bit
+            child_bb = current_bb | move_bit
+
+            if is_first_child:
+                # Full-window search for the expected best move
+                current_value = -_search(child_mask, opponent_bb, child_bb,
+                                                   opponent_id, depth + 1, -beta, -alpha)
+            else:
+                # Null-window "is it worse?" test...
+                current_value = -_search(child_mask, opponent_bb, child_bb,
+                                                   opponent_id, depth + 1, -alpha - 1, -alpha)
+                if alpha < current_value < beta:
+                    # ...it was actually better: re-search with a real window
+                    current_value = -_search(child_mask, opponent_bb, child_bb,
+                                                       opponent_id, depth + 1, -beta, -current_value)
+
+            # Un-hash the move (our local mask/current_bb were never changed)
+            self.zobrist_hash = self.zobrist_hash ^ zobrist_bit
+            self.zobrist_hash_mirror = self.zobrist_hash_mirror ^ zobrist_bit_mirror
+            is_first_child = False
+
+            # Keep the highest score found
+            if current_value > node_value:
+                node_value = current_value
+                best_move_col = col
+
+            # *** ALPHA-BETA PRUNING ***
+            # Raise alpha (the best score the mover has proven so far)
+            if node_value > alpha:
+                alpha = node_value
+
+            # If Alpha reaches Beta, the opponent will never allow this
+            # position anyway. So we stop looking (Prune).
+            if alpha >= beta:
+                # Remember the move that caused this cutoff as a "killer"
+                if col != killer_slot[0]:
+                    killer_slot[1] = killer_slot[0]
+                    killer_slot[0] = col
+                break
+
+        # --- TRANSPOSITION TABLE: STORE ---
+        # Record what we learned. If the search was cut off, the value is only
+        # a bound, and the flag says which kind.
+        if node_value <= alpha_original:
+            flag = TT_UPPER
+        elif node_value >= beta_original:
+            flag = TT_LOWER
+        else:
+            flag = TT_EXACT
+
+        # Replacement policy: keep the deeper analysis if the slot is taken.
+        # The stored column is translated into the canonical orientation.
+        if entry is None or entry[0] <= remaining_depth:
+            if tt_is_mirrored:
+                _tt[tt_key] = (remaining_depth, node_value, flag, COLS - 1 - best_move_col)
+            else:
+                _tt[tt_key] = (remaining_depth, node_value, flag, best_move_col)
+
+        return node_value
+
+
+# ==============================================================================
+# SECTION 3: THE USER INTERFACE (GUI)
+# This handles the window, buttons, and mouse clicks using Tkinter.
+# ==============================================================================
+
+class ConnectFourGUI:
+    def __init__(self, root_window):
+        self.master = root_window
+        self.master.title("Connect 4 - AI Project")
+
+        # Create the logic objects
+        self.board_logic = ConnectFourBoard()
+        self.ai_agent = MinimaxAI()
+
+        # Game State Variables
+        self.game_mode = None          # Will be 'AI' or 'Human'
+        self.active_player = PLAYER_HUMAN_ID
+        self.is_game_running = False
+
+        # A "Lock" variable. This prevents the user from clicking twice
+        # while the AI is thinking.
+        self.is_processing_move = False
+
+        # Graphics Settings
+        self.SQUARE_SIZE = 80
+        width_px = COLS * self.SQUARE_SIZE
+        height_px = ROWS * self.SQUARE_SIZE
+
+        # Create the container frame
+        self.main_frame = tk.Frame(self.master)
+        self.main_frame.pack(pady=10, padx=10)
+
+        # Start by showing the menu
+        self.show_start_menu()
+
+    def clear_screen(self):
+        """Removes all buttons and text from the screen."""
+        for widget in self.main_frame.winfo_children():
+            widget.destroy()
+
+    def show_start_menu(self):
+        """Shows the two buttons to pick the game mode."""
+        self.clear_screen()
+
+        # Title Text
+        title = tk.Label(self.main_frame, text="Select Game Mode", font=('Arial', 20, 'bold'))
+        title.pack(pady=30)
+
+        # Button 1: Human vs AI
+        btn_ai = tk.Button(self.main_frame, text="Human vs. AI",
+                           command=lambda: self.initialize_game('AI'),
+                           bg='#2196F3', fg='white', font=('Arial', 14, 'bold'),
+                           width=30, height=2)
+        btn_ai.pack(pady=15)
+
+        # Button 2: Human vs Human
+        btn_human = tk.Button(self.main_frame, text="Human vs. Human",
+                              command=lambda: self.initialize_game('Human'),
+                              bg='#FF9800', fg='white', font=('Arial', 14, 'bold'),
+                              width=30, height=2)
+        btn_human.pack(pady=15)
+
+    def show_game_board(self):
+        """Sets up the visual board grid."""
+        self.clear_screen()
+
+        # Create a separate frame for the game elements
+        self.game_frame = tk.Frame(self.main_frame)
+        self.game_frame.pack()
+
+        # Status Text (e.g. "Player 1 Turn")
+        self.status_label = tk.Label(self.game_frame, text="", font=('Arial', 14))
+        self.status_label.pack(pady=5)
+
+        # The Canvas is where we draw the circles
+        w = COLS * self.SQUARE_SIZE
+        h = ROWS * self.SQUARE_SIZE
+        self.canvas = tk.Canvas(self.game_frame, width=w, height=h, bg='blue')
+        self.canvas.pack(pady=10)
+
+        # Create every circle ONCE and remember the piece ovals' item ids.
+        # Redrawing later is then just recolouring an existing item instead of
+        # deleting and recreating up to 84 canvas objects per move.
+        self.piece_ids = []
+        for r in range(ROWS):
+            id_row = []
+            for c in range(COLS):
+                x1 = c * self.SQUARE_SIZE
+                y1 = r * self.SQUARE_SIZE
+                x2 = x1 + self.SQUARE_SIZE
+                y2 = y1 + self.SQUARE_SIZE
+
+                # The blue background circle (the empty hole look) never changes
+                self.canvas.create_oval(x1 + 5, y1 + 5, x2 - 5, y2 - 5,
+                                        fill="lightblue", outline="darkblue")
+
+                # The piece oval starts invisible; dropping a piece just fills it
+                piece = self.canvas.create_oval(x1 + 5, y1 + 5, x2 - 5, y2 - 5,
+                                                fill="", outline="")
+                id_row.append(piece)
+            self.piece_ids.append(id_row)
+
+        # Connect the mouse click event to our function
+        self.canvas.bind("<Button-1>", self.on_canvas_click)
+
+        # Restart Button
+        btn_restart = tk.Button(self.game_frame, text="Restart / Change Mode",
+                                command=self.reset_game,
+                                bg='#4CAF50', fg='white', font=('Arial', 12, 'bold'))
+        btn_restart.pack(pady=10)
+
+    def initialize_game(self, selected_mode):
+        """Sets up the variables to start a new game."""
+        self.game_mode = selected_mode
+        self.board_logic = ConnectFourBoard() # Reset board data
+        self.active_player = PLAYER_HUMAN_ID
+        self.is_game_running = True
+        self.is_processing_move = False # Unlock the mouse
+
+        self.show_game_board()
+
+        if self.game_mode == 'AI':
+            self.status_label.config(text="Human (Red) vs. AI (Yellow). Your Turn!")
+        else:
+            self.status_label.config(text="Player 1 (Red) vs. Player 2 (Yellow). P1's Turn!")
+
+        self.redraw_graphics()
+
+    def redraw_graphics(self, changed_cells=None):
+        """
+        Recolours the piece ovals to match the board data. Normally only the
+        cell of the move just played is passed in, so one itemconfig call
+        updates the screen; with no argument every cell is refreshed.
+        """
+        if changed_cells is None:
+            changed_cells = [(r, c) for r in range(ROWS) for c in range(COLS)]
+
+        for (r, c) in changed_cells:
+            # Check who owns this spot
+            piece_id = self.board_logic.piece_at(r, c)
+
+            if piece_id == PLAYER_HUMAN_ID:
+                self.canvas.itemconfig(self.piece_ids[r][c],
+                                       fill="red", outline="black", width=2)
+            elif piece_id == PLAYER_AI_ID:
+                self.canvas.itemconfig(self.piece_ids[r][c],
+                                       fill="yellow", outline="black", width=2)
+            else:
+                # Empty again (new game): make the piece oval invisible
+                self.canvas.itemconfig(self.piece_ids[r][c],
+                                       fill="", outline="")
+
+    def on_canvas_click(self, event):
+        """This runs when the user clicks the mouse on the board."""
+
+        # --- BUG FIX: INPUT LOCK ---
+        # If the game is over OR the computer is currently thinking, ignore the click.
+        if self.is_game_running == False:
+            return
+        if self.is_processing_move == True:
+            return
+
+        # Lock the input so the user can't click again immediately
+        self.is_processing_move = True
+
+        # Figure out which column was clicked
+        pixel_x = event.x
+        column_clicked = pixel_x // self.SQUARE_SIZE
+
+        # Check if this column is valid
+        legal_moves = self.board_logic.get_legal_actions()
+
+        if column_clicked in legal_moves:
+            # 1. Perform the Human's Move
+            landed_on = self.board_logic.make_move(column_clicked, self.active_player)
+
+            # Only the cell the piece landed on needs repainting
+            self.redraw_graphics([landed_on])
+
+            # 2. Check if Human Won
+            game_ended = self.check_game_over(self.active_player)
+            if game_ended == True:
+                self.is_processing_move = False # Unlock so they can click restart
+                return
+
+            # 3. Switch Turns
+            if self.game_mode == 'Human':
+                # Logic for 2-Player Mode
+                if self.active_player == PLAYER_HUMAN_ID:
+                    self.active_player = PLAYER_AI_ID # Player 2
+                    name = "Player 2 (Yellow)"
+                else:
+                    self.active_player = PLAYER_HUMAN_ID # Player 1
+                    name = "Player 1 (Red)"
+
+                self.status_label.config(text=f"{name}'s Turn")
+                self.is_processing_move = False # Unlock immediately for next human
+
+            elif self.game_mode == 'AI':
+                # Logic for AI Mode
+                self.active_player = PLAYER_AI_ID
+                self.status_label.config(text="AI is Thinking...")
+
+                # Start the AI immediately - it thinks on a background thread,
+                # so the window keeps repainting and responding on its own
+                self.run_ai_turn()
+        else:
+            # If they clicked a full column, just unlock and let them try again
+            self.is_processing_move = False
+
+
+    def check_game_over(self, player_id):
+        """Checks for Win or Draw. Returns True if game ended."""
+        # Check Win
+        has_won = self.board_logic.check_win(player_id)
+
+        if has_won:
+            winner_text = ""
+            if self.game_mode == 'AI':
+                if player_id == PLAYER_AI_ID:
+                    winner_text = "AI Player (Yellow) Wins!"
+                else:
+                    winner_text = "Human Player (Red) Wins!"
+            else:
+                if player_id == PLAYER_HUMAN_ID:
+                    winner_text = "Player 1 (Red) Wins!"
+                else:
+                    winner_text = "Player 2 (Yellow) Wins!"
+
+            self.trigger_game_over(winner_text)
+            return True
+
+        # Check Draw (No legal moves left)
+        available = self.board_logic.get_legal_actions()
+        if len(available) == 0:
+            self.trigger_game_over("It's a Draw!")
+            return True
+
+        return False
+
+    def run_ai_turn(self):
+        """Starts the AI thinking on a background thread."""
+        # Double check lock
+        if self.is_game_running == False:
+            self.is_processing_move = False
+            return
+
+        # Tkinter widgets may only be touched from the main thread, so the
+        # worker hands its answer back through a queue that we poll with
+        # 'after'. While the worker thinks, the main thread sits idle in the
+        # Tk event loop and the window stays fully responsive.
+        result_queue = queue.Queue()
+        worker = threading.Thread(target=self._ai_worker,
+                                  args=(result_queue,), daemon=True)
+        worker.start()
+
+        self.master.after(20, self._poll_ai_result, result_queue, self.board_logic)
+
+    def _ai_worker(self, result_queue):
+        """Runs on the background thread: pure computation, no GUI calls.
+
+        The live board is passed straight in: the search undoes every move
+        it tries, so the real game state is untouched when it returns.
+        (The input lock guarantees nobody else mutates the board meanwhile.)
+        """
+        result_queue.put(self.ai_agent.get_ai_move(self.board_logic))
+
+    def _poll_ai_result(self, result_queue, board_searched):
+        """Runs on the main thread every 20ms until the AI answer arrives."""
+        try:
+            best_col = result_queue.get_nowait()
+        except queue.Empty:
+            # Not done yet - check again shortly
+            self.master.after(20, self._poll_ai_result, result_queue, board_searched)
+            return
+
+        # The user may have hit Restart (and even started a new game) while
+        # the AI was thinking; a stale answer must not be played.
+        if self.is_game_running == False or board_searched is not self.board_logic:
+            self.is_processing_move = False
+            return
+
+        # 2. Make the AI move
+        landed_on = self.board_logic.make_move(best_col, PLAYER_AI_ID)
+
+        # Only the cell the piece landed on needs repainting
+        self.redraw_graphics([landed_on])
+
+        # 3. Check if AI won
+        game_ended = self.check_game_over(PLAYER_AI_ID)
+        if game_ended:
+            self.is_processing_move = False
+            return
+
+        # 4. Switch back to Human
+        self.active_player = PLAYER_HUMAN_ID
+        self.status_label.config(text="Your Turn (Red)")
+
+        # CRITICAL: Unlock the input now that AI is done
+        self.is_processing_move = False
+
+    def trigger_game_over(self, message_text):
+        """Freezes the game and shows a popup."""
+        self.is_game_running = False
+        self.status_label.config(text=message_text, fg='red', font=('Arial', 16, 'bold'))
+        messagebox.showinfo("Game Over", message_text)
+
+    def reset_game(self):
+        """Goes back to the start menu."""
+        self.is_game_running = False
+        self.game_mode = None
+        self.is_processing_move = False
+        self.show_start_menu()
+
+
+# ==============================================================================
+# MAIN EXECUTION
+# This block runs when you double-click the python file.
+# ==============================================================================
+if __name__ == '__main__':
+    # Create the main window
+    main_window = tk.Tk()
+
+    # Start the game logic
+    game_app = ConnectFourGUI(main_window)
+
+    # Keep the window open
+    main_window.mainloop()
@@ -0,0 +1,108 @@
+# ==============================================================================
+# OPENING BOOK BUILDER (run this file directly, once, from the command line)
+#
+# The first few AI moves of every game are spent re-searching positions that
+# never change between runs. This script walks every position reachable in the
+# first few plies, asks the normal search engine for its answer, and saves the
+# results to 'opening_book.pkl'. The game loads that file at startup and plays
+# book moves instantly instead of searching.
+#
+# Usage:  python build_opening_book.py [max_plies]
+#         (default 8 plies; deeper books take exponentially longer to build)
+# ==============================================================================
+
+import pickle
+import sys
+
+from CONNETC4 import (
+    COLS,
+    COLUMN_HEIGHT,
+    PLAYER_AI_ID,
+    PLAYER_HUMAN_ID,
+    ROWS,
+    ConnectFourBoard,
+    MinimaxAI,
+    connected_four,
+    mirror_bb,
+)
+
+BOOK_FILE = "opening_book.pkl"
+
+
+def build_book(max_plies):
+    """
+    Walks every legal position up to 'max_plies' pieces and solves the ones
+    where it is the AI's turn. Mirror-image positions are solved only once
+    and stored under their canonical (smaller) Zobrist hash, exactly like
+    the transposition table does during play.
+    """
+    ai = MinimaxAI()
+    book = {}
+    seen_positions = set()
+    solved_count = 0
+
+    board = ConnectFourBoard()
+
+    def walk(plies_played, player_to_move):
+        nonlocal solved_count
+
+        # Stop exploring finished games (somebody already connected four)
+        other_player = PLAYER_HUMAN_ID if player_to_move == PLAYER_AI_ID else PLAYER_AI_ID
+        if connected_four(board.bitboards[other_player - 1]):
+            return
+
+        position = (board.bitboards[0], board.bitboards[1])
+        if position in seen_positions:
+            return
+        seen_positions.add(position)
+
+        # Skip positions whose mirror image was already handled
+        mirrored = (mirror_bb(position[0]), mirror_bb(position[1]))
+        if mirrored != position and mirrored in seen_positions:
+            return
+
+        # Solve AI-to-move positions with the regular full-depth search
+        if player_to_move == PLAYER_AI_ID:
+            hash_value, hash_value_mirror = ai._compute_zobrist(board)
+            best_col = ai.get_ai_move(board)
+
+            # Store under the canonical orientation, like the TT does
+            if hash_value <= hash_value_mirror:
+                book[hash_value] = best_col
+            else:
+                book[hash_value_mirror] = COLS - 1 - best_col
+
+            solved_count += 1
+            if solved_count % 50 == 0:
+                print(f"  solved {solved_count} positions "
+                      f"({plies_played} plies deep)...")
+
+        if plies_played == max_plies:
+            return
+
+        for col in board.get_legal_actions():
+            board.make_move(col, player_to_move)
+            walk(plies_played + 1, other_player)
+
+            # Take the piece back out: it sits on the highest filled cell of
+            # the column it was dropped into, so XOR that bit off again.
+            column_shift = col * COLUMN_HEIGHT
+            column_bits = (board.mask >> column_shift) & ((1 << ROWS) - 1)
+            undo_bit = 1 << (column_shift + column_bits.bit_length() - 1)
+            board.bitboards[player_to_move - 1] ^= undo_bit
+            board.mask ^= undo_bit
+
+    walk(0, PLAYER_HUMAN_ID)
+    return book
+
+
+if __name__ == '__main__':
+    plies = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    print(f"Building opening book for the first {plies} plies...")
+
+    finished_book = build_book(plies)
+
+    with open(BOOK_FILE, 'wb') as book_file:
+        pickle.dump(finished_book, book_file)
+
+    print(f"Done: {len(finished_book)} positions saved to {BOOK_FILE}")